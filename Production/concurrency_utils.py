@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Concurrency Helpers
+===================
+
+Small executor utilities shared by the document and chunk loaders.
+"""
+
+from collections import deque
+
+
+def bounded_map(executor, fn, items, window: int):
+    """Like executor.map, but keeps only `window` calls submitted ahead of the consumer"""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
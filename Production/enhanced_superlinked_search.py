@@ -14,12 +14,162 @@ Addresses current limitations in discovery_search and other endpoints.
 
 from typing import Dict, List, Optional, Union
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+import itertools
 import json
+import logging
 import math
 
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        """Compact stdlib fallback matching orjson's bytes output"""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+logger = logging.getLogger(__name__)
+
+# Backend calls are counted so every _LOG_SAMPLE_EVERY-th one is logged at INFO
+_REQ_COUNTER = itertools.count(1)
+_LOG_SAMPLE_EVERY = 100
+
+# Default field weights for with_content_focus (read-only; copied per query)
+_CONTENT_FOCUS_DEFAULT = MappingProxyType({
+    'title': 3.0,
+    'executive_summary': 2.0,
+    'key_findings': 2.5,
+    'key_takeaways': 1.5,
+    'legal_topics': 2.0,
+    'keywords': 1.8,
+    'content': 1.0
+})
+
+# Builder defaults; _fast_build_legal reads the same values so the two can't drift
+_PREFERRED_AI_MODEL = "claude-opus-4-20250514"
+_AI_MODEL_BOOST = 1.5
+_STATE_BOOST = 2.0
+_CITY_BOOST = 3.0
+_DAYS_PER_MONTH = 30
+
+# Fixed settings of build_legal_research_query
+_LEGAL_RECENCY_DECAY_DAYS = 730
+_LEGAL_RECENCY_BOOST = 1.8
+_LEGAL_MONTHS_BACK = 24
+_LEGAL_FOCUS_FIELDS = ('title', 'executive_summary', 'key_findings', 'key_takeaways', 'legal_topics')
+_LEGAL_DOCUMENT_TYPES = ('statute', 'regulation', 'case')
+
+def _type_preference(preference_order) -> Dict[str, int]:
+    """document_type_preference boosts: the first preferred type scores highest"""
+    return {type_name: len(preference_order) - idx for idx, type_name in enumerate(preference_order)}
+
+# Default factor weights for with_multi_factor_relevance
+_MULTI_FACTOR_DEFAULT_ITEMS = (
+    ('semantic_similarity', 1.0),      # Base similarity score
+    ('content_authority', 0.3),        # Based on confidence_score
+    ('recency_factor', 0.2),           # Time decay
+    ('jurisdiction_match', 0.25),      # Jurisdiction relevance
+    ('practice_area_match', 0.2),      # Practice area alignment
+    ('factual_density', 0.15),         # Number of extracted facts
+    ('ai_processing_quality', 0.1)     # AI model quality
+)
+
+# Jurisdiction hierarchy fields, outermost first
+_HIERARCHY_FIELDS = ('jurisdiction_country', 'jurisdiction_state', 'jurisdiction_city')
+
+def match_hierarchy(country: np.ndarray, state: np.ndarray, city: np.ndarray,
+                    target_country: int, target_state: int, target_city: int) -> np.ndarray:
+    """
+    Boolean mask of candidates matching a jurisdiction hierarchy in one vectorized pass.
+    A target code of 0 matches any value at that level, and a candidate code of 0
+    (field not returned) is never treated as a mismatch.
+    """
+    return (((target_country == 0) | (country == 0) | (country == target_country)) &
+            ((target_state == 0) | (state == 0) | (state == target_state)) &
+            ((target_city == 0) | (city == 0) | (city == target_city)))
+
+def hierarchy_mask(entries: List[Dict], filters: Dict) -> np.ndarray:
+    """Encode result entries as per-level code arrays and match them against the filters"""
+    columns = []
+    targets = []
+    for field in _HIERARCHY_FIELDS:
+        # Intern this level's values to small ints; missing values get code 0
+        codes = {}
+        column = np.fromiter(
+            (codes.setdefault(value, len(codes) + 1) if value else 0
+             for value in ((entry.get('fields') or _EMPTY).get(field) for entry in entries)),
+            dtype=np.int32, count=len(entries)
+        )
+        target = filters.get(field)
+        columns.append(column)
+        targets.append(codes.setdefault(target, len(codes) + 1) if target else 0)
+    return match_hierarchy(*columns, *targets)
+
+# Shared read-only default for missing query sections
+_EMPTY = MappingProxyType({})
+
+# Filter key prefixes that indicate hierarchical filtering
+_HIER_PREFIXES = ('jurisdiction_', 'practice_area_')
+
+@lru_cache(maxsize=1024)
+def _parse_iso(date_str: str) -> int:
+    """Parse an ISO date string to a Unix timestamp (cached; dates repeat across requests)"""
+    if date_str.endswith('Z'):
+        date_str = date_str[:-1] + '+00:00'
+    return int(datetime.fromisoformat(date_str).timestamp())
+
+# Exact-type handlers for EnhancedLegalSearchQuery._normalize_date
+_DATE_DISPATCH = {
+    datetime: lambda d: int(d.timestamp()),
+    str: _parse_iso,
+    int: lambda d: d,
+}
+
+# Fixed search terms appended to discovery base queries
+_STATS_SUFFIX = ' statistics trends financial data billion million'
+_PROCEDURAL_TERMS = 'requirements deadlines procedures'
+
+# Maximum number of queries sent to the backend in a single batch call
+MAX_BATCH = 16
+
+# Jurisdiction aliases -> (country, state) for with_jurisdiction_hierarchy
+_JUR_MAP = {
+    'texas': ('united_states', 'texas'),
+    'tx': ('united_states', 'texas'),
+    'california': ('united_states', 'california'),
+    'ca': ('united_states', 'california'),
+}
+
+# Practice area aliases -> (primary, secondary) for with_practice_area_hierarchy
+_PRACTICE_MAP = {
+    'medical_malpractice': ('litigation', 'medical_malpractice'),
+    'healthcare': ('healthcare', None),
+}
+
+def _lookup_practice_area(practice_area: str) -> Optional[tuple]:
+    """Resolve a practice area string, falling back to substring matching"""
+    key = practice_area.casefold()
+    hierarchy = _PRACTICE_MAP.get(key)
+    if hierarchy is None:
+        # Preserve the original "contains" semantics for compound values
+        for name, value in _PRACTICE_MAP.items():
+            if name in key:
+                return value
+    return hierarchy
+
 class EnhancedLegalSearchQuery:
     """Enhanced query builder leveraging full legal document structure"""
     
+    __slots__ = (
+        'base_query', 'filters', 'boost_factors', 'sort_criteria',
+        'temporal_criteria', 'relevance_weights'
+    )
+    
     def __init__(self):
         self.base_query = ""
         self.filters = {}
@@ -49,7 +199,7 @@ class EnhancedLegalSearchQuery:
     
     def prefer_recent(self, months_back: int = 12):
         """Prefer documents from last N months"""
-        cutoff_date = datetime.now() - timedelta(days=months_back * 30)
+        cutoff_date = datetime.now() - timedelta(days=months_back * _DAYS_PER_MONTH)
         return self.with_publication_date_range(start_date=cutoff_date)
     
     # HIERARCHICAL STRUCTURE LEVERAGE
@@ -66,8 +216,8 @@ class EnhancedLegalSearchQuery:
         # If not exact match, also search broader jurisdictions
         if not exact_match and state:
             self.boost_factors['jurisdiction_relevance'] = {
-                'state_boost': 2.0,
-                'city_boost': 3.0 if city else 1.0
+                'state_boost': _STATE_BOOST,
+                'city_boost': _CITY_BOOST if city else 1.0
             }
         return self
     
@@ -83,30 +233,20 @@ class EnhancedLegalSearchQuery:
         return self
     
     def with_document_authority(self, min_confidence: int = 70, 
-                              prefer_ai_model: str = "claude-opus-4-20250514"):
+                              prefer_ai_model: str = _PREFERRED_AI_MODEL):
         """Filter by document authority and AI processing quality"""
         self.filters['min_confidence_score'] = min_confidence
         if prefer_ai_model:
             self.boost_factors['ai_model'] = {
                 'preferred_model': prefer_ai_model,
-                'boost_factor': 1.5
+                'boost_factor': _AI_MODEL_BOOST
             }
         return self
     
     # ADVANCED QUERY CAPABILITIES
     def with_content_focus(self, focus_fields: List[str], weights: Dict[str, float] = None):
         """Focus search on specific content fields with weights"""
-        default_weights = {
-            'title': 3.0,
-            'executive_summary': 2.0,
-            'key_findings': 2.5,
-            'key_takeaways': 1.5,
-            'legal_topics': 2.0,
-            'keywords': 1.8,
-            'content': 1.0
-        }
-        
-        self.relevance_weights = weights or default_weights
+        self.relevance_weights = weights or dict(_CONTENT_FOCUS_DEFAULT)
         self.filters['focus_fields'] = focus_fields
         return self
     
@@ -114,10 +254,7 @@ class EnhancedLegalSearchQuery:
         """Filter and optionally rank by document types"""
         self.filters['document_types'] = doc_types
         if preference_order:
-            self.boost_factors['document_type_preference'] = {
-                type_name: len(preference_order) - idx 
-                for idx, type_name in enumerate(preference_order)
-            }
+            self.boost_factors['document_type_preference'] = _type_preference(preference_order)
         return self
     
     def with_factual_density(self, min_fact_count: int = 3, boost_high_density: bool = True):
@@ -131,15 +268,9 @@ class EnhancedLegalSearchQuery:
     def with_multi_factor_relevance(self, enable_all: bool = True):
         """Enable sophisticated relevance scoring"""
         if enable_all:
-            self.relevance_weights.update({
-                'semantic_similarity': 1.0,      # Base similarity score
-                'content_authority': 0.3,        # Based on confidence_score
-                'recency_factor': 0.2,          # Time decay
-                'jurisdiction_match': 0.25,      # Jurisdiction relevance
-                'practice_area_match': 0.2,     # Practice area alignment
-                'factual_density': 0.15,        # Number of extracted facts
-                'ai_processing_quality': 0.1    # AI model quality
-            })
+            # Caller-provided weights win over the defaults
+            for factor, weight in _MULTI_FACTOR_DEFAULT_ITEMS:
+                self.relevance_weights.setdefault(factor, weight)
         return self
     
     def with_client_relevance_boost(self, min_client_score: int = 60):
@@ -151,15 +282,16 @@ class EnhancedLegalSearchQuery:
     # QUERY BUILDING METHODS
     def _normalize_date(self, date_input: Union[datetime, str, int]) -> int:
         """Normalize various date formats to Unix timestamp"""
-        if isinstance(date_input, datetime):
-            return int(date_input.timestamp())
-        elif isinstance(date_input, str):
-            # Parse ISO format
-            return int(datetime.fromisoformat(date_input.replace('Z', '+00:00')).timestamp())
-        elif isinstance(date_input, int):
-            return date_input
-        else:
-            raise ValueError(f"Unsupported date format: {type(date_input)}")
+        handler = _DATE_DISPATCH.get(type(date_input))
+        if handler is None:
+            # Subclasses (e.g. pandas Timestamp, bool) fall back to isinstance
+            for base, base_handler in _DATE_DISPATCH.items():
+                if isinstance(date_input, base):
+                    handler = base_handler
+                    break
+            else:
+                raise ValueError(f"Unsupported date format: {type(date_input)}")
+        return handler(date_input)
     
     def build_superlinked_query(self) -> Dict:
         """Build the final query for Superlinked API"""
@@ -175,11 +307,95 @@ class EnhancedLegalSearchQuery:
         # Remove empty sections
         return {k: v for k, v in query.items() if v}
 
+def _fast_build_legal(query: str, jurisdiction: Optional[tuple], practice: Optional[tuple],
+                      prefer_recent: bool, min_authority: int, limit: int) -> Dict:
+    """
+    Emit the legal research query in one pass.
+    Produces the same dict as chaining the EnhancedLegalSearchQuery builders
+    without the intermediate builder object or the empty-section filtering;
+    every value comes from the module constants those builders use.
+    """
+    filters = {}
+    boost_factors = {}
+    
+    if jurisdiction:
+        filters['jurisdiction_country'] = jurisdiction[0]
+        filters['jurisdiction_state'] = jurisdiction[1]
+        boost_factors['jurisdiction_relevance'] = {'state_boost': _STATE_BOOST, 'city_boost': 1.0}
+    
+    if practice:
+        filters['practice_area_primary'] = practice[0]
+        if practice[1]:
+            filters['practice_area_secondary'] = practice[1]
+    
+    if prefer_recent:
+        now = datetime.now()
+        boost_factors['recency'] = {
+            'decay_days': _LEGAL_RECENCY_DECAY_DAYS,
+            'boost_factor': _LEGAL_RECENCY_BOOST,
+            'reference_date': now.timestamp()
+        }
+    
+    filters['min_confidence_score'] = min_authority
+    boost_factors['ai_model'] = {
+        'preferred_model': _PREFERRED_AI_MODEL,
+        'boost_factor': _AI_MODEL_BOOST
+    }
+    filters['focus_fields'] = list(_LEGAL_FOCUS_FIELDS)
+    filters['document_types'] = list(_LEGAL_DOCUMENT_TYPES)
+    boost_factors['document_type_preference'] = _type_preference(_LEGAL_DOCUMENT_TYPES)
+    
+    enhanced_query = {}
+    if query:
+        enhanced_query['search_query'] = query
+    enhanced_query['filters'] = filters
+    enhanced_query['boost_factors'] = boost_factors
+    if prefer_recent:
+        # Same cutoff as prefer_recent(months_back=_LEGAL_MONTHS_BACK)
+        enhanced_query['temporal_criteria'] = {
+            'min_publication_date': int((now - timedelta(days=_LEGAL_MONTHS_BACK * _DAYS_PER_MONTH)).timestamp())
+        }
+    # with_content_focus replaces the multi-factor weights with its defaults
+    enhanced_query['relevance_weights'] = dict(_CONTENT_FOCUS_DEFAULT)
+    enhanced_query['limit'] = limit
+    return enhanced_query
+
 class EnhancedDiscoverySearch:
     """Enhanced discovery search leveraging full legal document structure"""
     
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(self, base_url: str = "http://localhost:8080",
+                 shard_urls: Optional[Dict[str, str]] = None,
+                 remote: bool = False,
+                 timeout: float = 10.0):
         self.base_url = base_url
+        # Practice area -> backend URL; queries without a matching shard use 'default'
+        self.shard_urls = {'default': base_url}
+        if shard_urls:
+            self.shard_urls.update(shard_urls)
+        
+        # Opt-in: POST to {shard}/search/batch when True; otherwise return placeholder
+        # responses, as this class always has. The batch endpoint is not part of the
+        # Superlinked app in this repo: it is assumed to take {"queries": [...]} and reply
+        # {"results": [{"entries": [...]}, ...]} with one result per query, in order
+        self.remote = remote
+        self.timeout = timeout
+        
+        # One keep-alive session shared by every search call
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
+        adapter = HTTPAdapter(pool_connections=len(self.shard_urls), pool_maxsize=32)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def legal_research_discovery(self, 
                                query: str,
@@ -191,68 +407,8 @@ class EnhancedDiscoverySearch:
         """
         Enhanced discovery search for legal research with intelligent defaults
         """
-        
-        # Build enhanced query
-        search_query = EnhancedLegalSearchQuery()
-        search_query.base_query = query
-        
-        # Apply jurisdiction intelligence
-        if jurisdiction:
-            # Intelligent jurisdiction parsing
-            if jurisdiction.lower() in ['texas', 'tx']:
-                search_query.with_jurisdiction_hierarchy(
-                    country='united_states', 
-                    state='texas'
-                )
-            elif jurisdiction.lower() in ['california', 'ca']:
-                search_query.with_jurisdiction_hierarchy(
-                    country='united_states', 
-                    state='california'
-                )
-        
-        # Apply practice area filtering
-        if practice_area:
-            if 'medical_malpractice' in practice_area.lower():
-                search_query.with_practice_area_hierarchy(
-                    primary='litigation',
-                    secondary='medical_malpractice'
-                )
-            elif 'healthcare' in practice_area.lower():
-                search_query.with_practice_area_hierarchy(
-                    primary='healthcare'
-                )
-        
-        # Apply recency preferences
-        if prefer_recent:
-            search_query.with_recency_boost(decay_days=730, boost_factor=1.8)
-            search_query.prefer_recent(months_back=24)  # Prefer last 2 years
-        
-        # Apply authority filtering
-        search_query.with_document_authority(
-            min_confidence=min_authority,
-            prefer_ai_model="claude-opus-4-20250514"
-        )
-        
-        # Enable multi-factor relevance
-        search_query.with_multi_factor_relevance()
-        
-        # Focus on key content fields for legal research
-        search_query.with_content_focus([
-            'title', 'executive_summary', 'key_findings', 
-            'key_takeaways', 'legal_topics'
-        ])
-        
-        # Prefer high-quality document types
-        search_query.with_document_types(
-            ['statute', 'regulation', 'case'],
-            preference_order=['statute', 'regulation', 'case']
-        )
-        
-        # Build final query
-        enhanced_query = search_query.build_superlinked_query()
-        enhanced_query['limit'] = limit
-        
-        return self._execute_enhanced_search(enhanced_query)
+        return self._execute_enhanced_search(self.build_legal_research_query(
+            query, jurisdiction, practice_area, prefer_recent, min_authority, limit))
     
     def statistical_research_discovery(self,
                                      topic: str,
@@ -262,10 +418,64 @@ class EnhancedDiscoverySearch:
         """
         Specialized discovery for statistical/financial legal data
         """
+        return self._execute_enhanced_search(self.build_statistical_research_query(
+            topic, jurisdiction, require_financial_data, limit))
+    
+    def procedural_requirements_discovery(self,
+                                        procedure_type: str,
+                                        jurisdiction: str = "texas",
+                                        practice_area: str = "medical_malpractice",
+                                        limit: int = 5) -> Dict:
+        """
+        Specialized discovery for legal procedural requirements
+        """
+        return self._execute_enhanced_search(self.build_procedural_requirements_query(
+            procedure_type, jurisdiction, practice_area, limit))
+    
+    def search_batch(self, enhanced_queries: List[Dict]) -> List[Dict]:
+        """
+        Execute several built queries, batching up to MAX_BATCH per backend call.
+        Results are returned in the same order as the queries.
+        """
+        results = []
+        for start in range(0, len(enhanced_queries), MAX_BATCH):
+            results.extend(self._execute_enhanced_search_batch(enhanced_queries[start:start + MAX_BATCH]))
+        return results
+    
+    def build_legal_research_query(self, 
+                                   query: str,
+                                   jurisdiction: str = "texas",
+                                   practice_area: str = None,
+                                   prefer_recent: bool = True,
+                                   min_authority: int = 70,
+                                   limit: int = 5) -> Dict:
+        """
+        Build a legal research query with intelligent defaults
+        """
+        
+        # Every legal research query has the same shape, so skip the fluent
+        # builder and emit the final dict directly
+        return _fast_build_legal(
+            query,
+            _JUR_MAP.get(jurisdiction.casefold()) if jurisdiction else None,
+            _lookup_practice_area(practice_area) if practice_area else None,
+            prefer_recent,
+            min_authority,
+            limit
+        )
+    
+    def build_statistical_research_query(self,
+                                         topic: str,
+                                         jurisdiction: str = "texas",
+                                         require_financial_data: bool = True,
+                                         limit: int = 3) -> Dict:
+        """
+        Build a query specialized for statistical/financial legal data
+        """
         
         # Build query focused on statistical content
         search_query = EnhancedLegalSearchQuery()
-        search_query.base_query = f"{topic} statistics trends financial data billion million"
+        search_query.base_query = topic + _STATS_SUFFIX
         
         # Jurisdiction filtering
         if jurisdiction:
@@ -300,19 +510,19 @@ class EnhancedDiscoverySearch:
         enhanced_query = search_query.build_superlinked_query()
         enhanced_query['limit'] = limit
         
-        return self._execute_enhanced_search(enhanced_query)
+        return enhanced_query
     
-    def procedural_requirements_discovery(self,
-                                        procedure_type: str,
-                                        jurisdiction: str = "texas",
-                                        practice_area: str = "medical_malpractice",
-                                        limit: int = 5) -> Dict:
+    def build_procedural_requirements_query(self,
+                                            procedure_type: str,
+                                            jurisdiction: str = "texas",
+                                            practice_area: str = "medical_malpractice",
+                                            limit: int = 5) -> Dict:
         """
-        Specialized discovery for legal procedural requirements
+        Build a query specialized for legal procedural requirements
         """
         
         search_query = EnhancedLegalSearchQuery()
-        search_query.base_query = f"{procedure_type} requirements deadlines procedures {jurisdiction}"
+        search_query.base_query = ' '.join((procedure_type, _PROCEDURAL_TERMS, str(jurisdiction)))
         
         # Jurisdiction and practice area filtering
         search_query.with_jurisdiction_hierarchy(state=jurisdiction)
@@ -344,31 +554,84 @@ class EnhancedDiscoverySearch:
         enhanced_query = search_query.build_superlinked_query()
         enhanced_query['limit'] = limit
         
-        return self._execute_enhanced_search(enhanced_query)
+        return enhanced_query
     
     def _execute_enhanced_search(self, enhanced_query: Dict) -> Dict:
+        """Execute a single enhanced search query"""
+        return self._execute_enhanced_search_batch([enhanced_query])[0]
+    
+    def _shard_url_for(self, enhanced_query: Dict) -> str:
+        """Pick the backend shard for a query based on its primary practice area"""
+        practice_area = (enhanced_query.get('filters') or _EMPTY).get('practice_area_primary')
+        return self.shard_urls.get(practice_area, self.shard_urls['default'])
+    
+    def _execute_enhanced_search_batch(self, enhanced_queries: List[Dict]) -> List[Dict]:
         """
-        Execute the enhanced search query
-        (This would integrate with your actual Superlinked implementation)
+        Execute a batch of enhanced search queries with one backend call per shard.
+        Responses are returned in the same order as the queries.
+        """
+        positions_by_shard = {}
+        for position, enhanced_query in enumerate(enhanced_queries):
+            positions_by_shard.setdefault(self._shard_url_for(enhanced_query), []).append(position)
+        
+        responses = [None] * len(enhanced_queries)
+        for shard_url, positions in positions_by_shard.items():
+            shard_queries = [enhanced_queries[i] for i in positions]
+            for position, response in zip(positions, self._search_shard(shard_url, shard_queries)):
+                responses[position] = response
+        return responses
+    
+    def _search_shard(self, shard_url: str, enhanced_queries: List[Dict]) -> List[Dict]:
+        """
+        Send a batch of queries to a single shard
+        (Without remote=True this returns placeholder responses; see __init__
+        for the assumed /search/batch request and reply format)
         """
         
-        # For now, this is a framework - you would integrate with actual Superlinked API
-        # The enhanced_query contains all the sophisticated filtering and boosting logic
-        
-        print("Enhanced Query Structure:")
-        print(json.dumps(enhanced_query, indent=2))
-        
-        # Placeholder response structure
-        return {
-            "enhanced_query": enhanced_query,
-            "execution_notes": [
-                "Multi-factor relevance scoring applied",
-                "Temporal boosting configured", 
-                "Hierarchical filtering enabled",
-                "Authority thresholds applied"
-            ],
-            "search_strategy": self._analyze_search_strategy(enhanced_query)
-        }
+        # The enhanced queries contain all the sophisticated filtering and boosting logic
+        # and are POSTed together to {shard_url}/search/batch as the body below
+        body = _json_dumps({"queries": enhanced_queries})
+        request_number = next(_REQ_COUNTER)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Enhanced Query Structure (%s): %s", shard_url, body.decode())
+        elif request_number % _LOG_SAMPLE_EVERY == 0 and logger.isEnabledFor(logging.INFO):
+            logger.info("Sampled enhanced query batch #%d (%s): %s",
+                        request_number, shard_url, body.decode())
+        
+        if self.remote:
+            response = self.session.post(f"{shard_url}/search/batch", data=body, timeout=self.timeout)
+            response.raise_for_status()
+            results = response.json().get('results', [])
+            # Results are matched to queries by position, so a short or long reply can't be trusted
+            if len(results) != len(enhanced_queries):
+                raise ValueError(f"{shard_url} returned {len(results)} results "
+                                 f"for {len(enhanced_queries)} queries")
+        else:
+            # Placeholder until the batch endpoint is deployed
+            results = [{} for _ in enhanced_queries]
+        
+        responses = []
+        for enhanced_query, result in zip(enhanced_queries, results):
+            entries = result.get('entries', [])
+            filters = enhanced_query.get('filters') or _EMPTY
+            # Only exact-match queries filter; a jurisdiction_relevance boost
+            # (exact_match=False) leaves ranking of broader matches to the backend
+            if (entries and any(field in filters for field in _HIERARCHY_FIELDS)
+                    and 'jurisdiction_relevance' not in (enhanced_query.get('boost_factors') or _EMPTY)):
+                entries = [entry for entry, keep in zip(entries, hierarchy_mask(entries, filters)) if keep]
+            responses.append({
+                "enhanced_query": enhanced_query,
+                "shard_url": shard_url,
+                "entries": entries,
+                "execution_notes": [
+                    "Multi-factor relevance scoring applied",
+                    "Temporal boosting configured", 
+                    "Hierarchical filtering enabled",
+                    "Authority thresholds applied"
+                ],
+                "search_strategy": self._analyze_search_strategy(enhanced_query)
+            })
+        return responses
     
     def _analyze_search_strategy(self, query: Dict) -> Dict:
         """Analyze the search strategy for debugging/optimization"""
@@ -380,20 +643,22 @@ class EnhancedDiscoverySearch:
             "content_focus": []
         }
         
+        filters = query.get('filters') or _EMPTY
+        boost = query.get('boost_factors') or _EMPTY
+        
         if query.get('temporal_criteria'):
             strategy["temporal_strategy"] = "date_range_filtering"
-        if query.get('boost_factors', {}).get('recency'):
+        if boost.get('recency'):
             strategy["temporal_strategy"] = "recency_boosted"
             
-        if query.get('filters', {}).get('min_confidence_score'):
+        if filters.get('min_confidence_score'):
             strategy["authority_filtering"] = True
             
-        if any(key.startswith('jurisdiction_') or key.startswith('practice_area_') 
-               for key in query.get('filters', {})):
+        if any(key.startswith(_HIER_PREFIXES) for key in filters):
             strategy["hierarchical_filtering"] = True
             
-        strategy["relevance_factors"] = list(query.get('relevance_weights', {}).keys())
-        strategy["content_focus"] = query.get('filters', {}).get('focus_fields', [])
+        strategy["relevance_factors"] = list(query.get('relevance_weights') or _EMPTY)
+        strategy["content_focus"] = filters.get('focus_fields', [])
         
         return strategy
 
@@ -403,33 +668,35 @@ def example_enhanced_searches():
     
     search_engine = EnhancedDiscoverySearch()
     
-    print("=== EXAMPLE 1: COMPREHENSIVE LEGAL RESEARCH ===")
-    result1 = search_engine.legal_research_discovery(
-        query="medical malpractice expert witness requirements",
-        jurisdiction="texas",
-        practice_area="medical_malpractice",
-        prefer_recent=True,
-        min_authority=80,
-        limit=5
-    )
-    
-    print("\n=== EXAMPLE 2: STATISTICAL DATA RESEARCH ===")
-    result2 = search_engine.statistical_research_discovery(
-        topic="medical malpractice",
-        jurisdiction="texas",
-        require_financial_data=True,
-        limit=3
-    )
+    # Build all three queries up front so they run as one backend call
+    queries = [
+        search_engine.build_legal_research_query(
+            query="medical malpractice expert witness requirements",
+            jurisdiction="texas",
+            practice_area="medical_malpractice",
+            prefer_recent=True,
+            min_authority=80,
+            limit=5
+        ),
+        search_engine.build_statistical_research_query(
+            topic="medical malpractice",
+            jurisdiction="texas",
+            require_financial_data=True,
+            limit=3
+        ),
+        search_engine.build_procedural_requirements_query(
+            procedure_type="expert witness",
+            jurisdiction="texas",
+            practice_area="medical_malpractice",
+            limit=5
+        )
+    ]
     
-    print("\n=== EXAMPLE 3: PROCEDURAL REQUIREMENTS ===")
-    result3 = search_engine.procedural_requirements_discovery(
-        procedure_type="expert witness",
-        jurisdiction="texas",
-        practice_area="medical_malpractice",
-        limit=5
-    )
+    print("=== EXAMPLES 1-3: LEGAL RESEARCH, STATISTICAL DATA, PROCEDURAL REQUIREMENTS ===")
+    result1, result2, result3 = search_engine.search_batch(queries)
     
     return result1, result2, result3
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     example_enhanced_searches()
\ No newline at end of file
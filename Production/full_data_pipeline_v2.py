@@ -14,15 +14,230 @@ import os
 import sys
 import json
 import time
+import queue
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import signal
 from pathlib import Path
 from typing import Dict, List, Optional
 import click
 from dotenv import load_dotenv
 
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+from load_real_data import SuperlinkedDataLoader
+from load_chunks import ChunkLoader
+
+def _count_files(directory, suffix: str, recursive: bool = False) -> int:
+    """Count files ending in suffix with os.scandir (file type comes from the directory listing, no stat per entry)"""
+    count = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(suffix):
+                    count += 1
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    count += _count_files(entry.path, suffix, recursive)
+    except FileNotFoundError:
+        pass
+    return count
+
+class _DirCounter:
+    """Count files in a directory, rescanning only when the directory's mtime changes"""
+    
+    def __init__(self, directory: Path, suffix: str):
+        self.directory = directory
+        self.suffix = suffix
+        self._mtime = None
+        self._count = 0
+    
+    def count(self) -> int:
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+        if mtime != self._mtime:
+            self._mtime = mtime
+            self._count = _count_files(self.directory, self.suffix)
+        return self._count
+
+class _NewFileReporter:
+    """watchdog handler that reports each new .json file in a watched output directory"""
+    
+    def __init__(self, counts: Dict[str, int], labels: Dict[str, str]):
+        self.counts = counts
+        self.labels = labels
+    
+    def dispatch(self, event):
+        if event.is_directory or event.event_type not in ("created", "moved"):
+            return
+        path = Path(getattr(event, "dest_path", "") or event.src_path)
+        subdir = path.parent.name
+        if path.suffix == ".json" and subdir in self.counts:
+            self.counts[subdir] += 1
+            print(f"{self.labels[subdir]}: {self.counts[subdir]}")
+
+def _start_line_reader(process) -> "queue.Queue":
+    """
+    Read a subprocess's stdout on a daemon thread.
+    Lines are delivered through the returned queue as soon as they arrive;
+    None is queued once the pipe reaches EOF.
+    """
+    lines = queue.Queue()
+    
+    def reader():
+        for line in iter(process.stdout.readline, ""):
+            lines.put(line)
+        lines.put(None)
+    
+    threading.Thread(target=reader, daemon=True).start()
+    return lines
+
+def _popen_group(cmd: List[str]) -> subprocess.Popen:
+    """Start cmd in its own process group so the whole tree can be signalled"""
+    kwargs = {}
+    if os.name == "posix":
+        kwargs["start_new_session"] = True
+    else:
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    return subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        bufsize=1,
+        **kwargs
+    )
+
+def _signal_group(process: subprocess.Popen, sig) -> None:
+    """Send sig to the process group (POSIX) or just the child (Windows)"""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, sig)
+        elif sig == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+def _kill_tree(process: subprocess.Popen, grace_seconds: float = 5) -> None:
+    """SIGTERM the process tree, then SIGKILL anything still alive after the grace period"""
+    if process.poll() is not None:
+        return
+    _signal_group(process, signal.SIGTERM)
+    try:
+        process.wait(timeout=grace_seconds)
+    except subprocess.TimeoutExpired:
+        print("🔪 Force killing process...")
+    # Also reaps workers that outlived their parent
+    _signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+    process.wait()
+
+class GracefulKiller:
+    """
+    Turn SIGINT/SIGTERM into a flag the streaming loop checks, so schedulers
+    that send SIGTERM get the same clean shutdown as Ctrl+C.
+    Previous handlers are restored on exit.
+    """
+    
+    SIGNALS = (signal.SIGINT, signal.SIGTERM)
+    
+    def __init__(self):
+        self.kill_now = False
+        self.signum = None
+        self._previous = {}
+    
+    def _handle(self, signum, frame):
+        self.kill_now = True
+        self.signum = signum
+    
+    def __enter__(self):
+        for sig in self.SIGNALS:
+            self._previous[sig] = signal.signal(sig, self._handle)
+        return self
+    
+    def __exit__(self, *exc):
+        for sig, handler in self._previous.items():
+            signal.signal(sig, handler)
+        self._previous.clear()
+
+# How often a blocked read wakes up to check for a shutdown signal
+_SIGNAL_CHECK_SECONDS = 0.5
+
+def _run_with_timeout(cmd: List[str], timeout_seconds: float, grace_seconds: float = 5,
+                      killer: Optional[GracefulKiller] = None):
+    """
+    Run cmd and yield its output lines as they arrive.
+    
+    Raises subprocess.TimeoutExpired once the deadline passes and
+    subprocess.CalledProcessError on a non-zero exit. If killer is given the
+    generator stops early once it sees a shutdown signal. The process tree is
+    always killed on the way out (timeout, signal or an abandoned generator).
+    """
+    process = _popen_group(cmd)
+    lines = _start_line_reader(process)
+    deadline = time.monotonic() + timeout_seconds
+    try:
+        while killer is None or not killer.kill_now:
+            # Block until a line arrives, the deadline passes or it's time to check for signals
+            remaining = deadline - time.monotonic()
+            wait = remaining if killer is None else min(remaining, _SIGNAL_CHECK_SECONDS)
+            try:
+                line = lines.get(timeout=max(0, wait))
+            except queue.Empty:
+                if time.monotonic() < deadline:
+                    continue
+                _kill_tree(process, grace_seconds)
+                raise subprocess.TimeoutExpired(cmd, timeout_seconds)
+            if line is None:
+                break
+            yield line
+        else:
+            # Shutdown signal received; the finally block tears the tree down
+            return
+        
+        return_code = process.wait()
+        if return_code != 0:
+            raise subprocess.CalledProcessError(return_code, cmd)
+    finally:
+        _kill_tree(process, grace_seconds)
+
+def _call_with_timeout(func, timeout_seconds: float, grace_seconds: float = 60):
+    """
+    Run func(cancel=event) on a worker thread and return its result.
+    If it overruns, the event is set so the loader stops and drops its queued
+    work; requests already in flight get grace_seconds to finish before
+    TimeoutError is raised. The worker is a daemon thread so a stuck loader
+    cannot keep the interpreter alive on exit.
+    """
+    outcome = {}
+    cancel = threading.Event()
+    
+    def worker():
+        try:
+            outcome['result'] = func(cancel=cancel)
+        except BaseException as e:
+            outcome['error'] = e
+    
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    thread.join(timeout_seconds)
+    if thread.is_alive():
+        cancel.set()
+        thread.join(grace_seconds)
+        raise TimeoutError(f"Timed out after {timeout_seconds}s")
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
 class FullDataPipelineV2:
     """Enhanced pipeline with better logging and timeout handling"""
     
@@ -33,14 +248,23 @@ class FullDataPipelineV2:
             print("✅ Loaded .env.local file")
         
         self.base_url = superlinked_url
+        
+        # Keep-alive session shared by the health check and search verification
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
         self.raw_data_dir = Path("raw_data")
         self.output_dir = Path("output")
         self.scripts_dir = Path("scripts")
         
-        # Ensure directories exist
-        self.output_dir.mkdir(exist_ok=True)
-        for subdir in ["metadata", "chunks", "embeddings", "logs"]:
-            (self.output_dir / subdir).mkdir(exist_ok=True)
+        # Ensure directories exist (makedirs creates output/ itself on the first call)
+        for subdir in ("metadata", "chunks", "embeddings", "logs"):
+            os.makedirs(os.path.join(self.output_dir, subdir), exist_ok=True)
     
     def check_environment(self) -> bool:
         """Check that all required components are available"""
@@ -53,16 +277,16 @@ class FullDataPipelineV2:
             return False
         
         # Check for PDFs
-        pdf_files = list(self.raw_data_dir.rglob("*.pdf"))
-        if not pdf_files:
+        pdf_count = _count_files(self.raw_data_dir, ".pdf", recursive=True)
+        if not pdf_count:
             print(f"❌ No PDF files found in {self.raw_data_dir}")
             return False
         
-        print(f"✅ Found {len(pdf_files)} PDF files")
+        print(f"✅ Found {pdf_count} PDF files")
         
         # Check Superlinked server
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = self.session.get(f"{self.base_url}/health", timeout=5)
             if response.status_code == 200:
                 print("✅ Superlinked server is running")
             else:
@@ -83,83 +307,74 @@ class FullDataPipelineV2:
         print("✅ Environment check passed")
         return True
     
-    def stream_subprocess_output(self, process, timeout_hours=4):
+    def stream_subprocess_output(self, cmd: List[str], timeout_hours=4):
         """Stream subprocess output in real-time with timeout"""
-        timeout_seconds = timeout_hours * 3600
-        start_time = time.time()
-        
         print(f"⏱️  Timeout set to {timeout_hours} hours")
         print("📊 Streaming live output (Ctrl+C to cancel):")
         print("-" * 60)
         
         try:
-            while True:
-                # Check timeout
-                if time.time() - start_time > timeout_seconds:
-                    print(f"\n⏰ Timeout reached ({timeout_hours} hours). Terminating process...")
-                    process.terminate()
-                    time.sleep(5)
-                    if process.poll() is None:
-                        print("🔪 Force killing process...")
-                        process.kill()
-                    return False, "Timeout"
-                
-                # Read output
-                output = process.stdout.readline()
-                if output:
+            with GracefulKiller() as killer:
+                for output in _run_with_timeout(cmd, timeout_hours * 3600, killer=killer):
                     print(output.rstrip())
-                elif process.poll() is not None:
-                    # Process finished
-                    break
-                
-                time.sleep(0.1)
-            
-            # Get final return code
-            return_code = process.poll()
-            if return_code == 0:
-                print("-" * 60)
-                print("✅ Process completed successfully")
-                return True, "Success"
-            else:
-                print("-" * 60)
-                print(f"❌ Process failed with return code {return_code}")
-                return False, f"Exit code {return_code}"
-                
-        except KeyboardInterrupt:
-            print("\n🛑 User cancelled. Terminating process...")
-            process.terminate()
-            time.sleep(5)
-            if process.poll() is None:
-                print("🔪 Force killing process...")
-                process.kill()
+        except subprocess.TimeoutExpired:
+            print(f"\n⏰ Timeout reached ({timeout_hours} hours). Process terminated.")
+            return False, "Timeout"
+        except subprocess.CalledProcessError as e:
+            print("-" * 60)
+            print(f"❌ Process failed with return code {e.returncode}")
+            return False, f"Exit code {e.returncode}"
+        
+        if killer.kill_now:
+            print(f"\n🛑 Received {signal.Signals(killer.signum).name}. Process terminated.")
             return False, "User cancelled"
+        
+        print("-" * 60)
+        print("✅ Process completed successfully")
+        return True, "Success"
     
     def monitor_progress(self):
-        """Monitor processing progress by counting output files"""
+        """
+        Monitor processing progress by counting output files.
+        Returns a callable that stops the monitor.
+        """
+        labels = {
+            "metadata": "📄 Documents processed",
+            "chunks": "🧩 Chunk files created"
+        }
+        
+        if Observer is not None:
+            # Event-driven: the OS reports new files as they are written
+            counts = {subdir: _count_files(self.output_dir / subdir, ".json") for subdir in labels}
+            observer = Observer()
+            handler = _NewFileReporter(counts, labels)
+            for subdir in labels:
+                observer.schedule(handler, str(self.output_dir / subdir), recursive=False)
+            observer.daemon = True
+            observer.start()
+            return observer.stop
+        
+        stop_event = threading.Event()
+        
         def progress_thread():
-            last_metadata_count = 0
-            last_chunk_count = 0
+            last_counts = dict.fromkeys(labels, 0)
+            counters = {subdir: _DirCounter(self.output_dir / subdir, ".json") for subdir in labels}
             
-            while True:
+            while not stop_event.is_set():
                 try:
-                    metadata_count = len(list(self.output_dir.glob("metadata/*.json")))
-                    chunk_count = len(list(self.output_dir.glob("chunks/*.json")))
-                    
-                    if metadata_count > last_metadata_count:
-                        print(f"📄 Documents processed: {metadata_count}")
-                        last_metadata_count = metadata_count
-                    
-                    if chunk_count > last_chunk_count:
-                        print(f"🧩 Chunk files created: {chunk_count}")
-                        last_chunk_count = chunk_count
+                    for subdir, counter in counters.items():
+                        count = counter.count()
+                        if count > last_counts[subdir]:
+                            print(f"{labels[subdir]}: {count}")
+                            last_counts[subdir] = count
                     
-                    time.sleep(10)  # Check every 10 seconds
+                    stop_event.wait(10)  # Check every 10 seconds
                 except:
                     break
         
         thread = threading.Thread(target=progress_thread, daemon=True)
         thread.start()
-        return thread
+        return stop_event.set
     
     def run_ai_processing(self, limit: Optional[int] = None, timeout_hours: float = 4) -> bool:
         """Run AI processing with real-time logging and timeout"""
@@ -181,20 +396,11 @@ class FullDataPipelineV2:
         print(f"🔧 Running: {' '.join(cmd)}")
         
         # Start progress monitoring
-        progress_monitor = self.monitor_progress()
+        stop_progress_monitor = self.monitor_progress()
         
         try:
-            # Start subprocess with real-time output
-            process = subprocess.Popen(
-                cmd, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1
-            )
-            
             # Stream output with timeout
-            success, message = self.stream_subprocess_output(process, timeout_hours)
+            success, message = self.stream_subprocess_output(cmd, timeout_hours)
             
             if success:
                 print("✅ AI processing completed successfully")
@@ -206,6 +412,8 @@ class FullDataPipelineV2:
         except Exception as e:
             print(f"❌ AI processing failed with exception: {e}")
             return False
+        finally:
+            stop_progress_monitor()
     
     def load_documents(self, timeout_minutes: int = 30) -> Dict:
         """Load processed documents into Superlinked with timeout"""
@@ -213,47 +421,31 @@ class FullDataPipelineV2:
         
         try:
             # Check what we have to load
-            metadata_files = list(self.output_dir.glob("metadata/*.json"))
-            if not metadata_files:
+            metadata_count = _count_files(self.output_dir / "metadata", ".json")
+            if not metadata_count:
                 print("⚠️  No metadata files found. Skipping document loading.")
                 return {'success': True, 'stats': {'documents': '0 (none to load)'}}
             
-            print(f"📊 Found {len(metadata_files)} metadata files to load")
-            
-            # Use existing load_real_data.py script with timeout
-            process = subprocess.Popen([
-                "python3", "load_real_data.py"
-            ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+            print(f"📊 Found {metadata_count} metadata files to load")
             
+            # Run the load_real_data.py loader in-process with timeout
             print("📊 Document loading progress:")
-            start_time = time.time()
-            timeout_seconds = timeout_minutes * 60
-            
-            while True:
-                # Check timeout
-                if time.time() - start_time > timeout_seconds:
-                    print(f"\n⏰ Document loading timeout ({timeout_minutes}min). Terminating...")
-                    process.terminate()
-                    time.sleep(5)
-                    if process.poll() is None:
-                        process.kill()
-                    return {'success': False, 'error': 'Timeout'}
-                
-                # Read output
-                output = process.stdout.readline()
-                if output:
-                    print(f"  {output.rstrip()}")
-                elif process.poll() is not None:
-                    break
-                
-                time.sleep(0.1)
+            loader = SuperlinkedDataLoader(self.base_url, output_dir=self.output_dir)
+            try:
+                results = _call_with_timeout(loader.load_batch, timeout_minutes * 60)
+            except TimeoutError:
+                print(f"\n⏰ Document loading timeout ({timeout_minutes}min).")
+                return {'success': False, 'error': 'Timeout'}
             
-            if process.returncode == 0:
-                print("✅ Documents loaded successfully")
-                return {'success': True, 'stats': {'documents': f'{len(metadata_files)} processed'}}
+            summary = f"{len(results['success'])} loaded, {len(results['failed'])} failed"
+            if results['failed'] and not results['success']:
+                print(f"❌ No documents loaded ({summary})")
+                return {'success': False, 'error': f"All documents failed to load ({summary})"}
+            if results['failed']:
+                print(f"⚠️  Documents loaded with failures ({summary})")
             else:
-                print("❌ Document loading failed")
-                return {'success': False, 'error': f'Exit code {process.returncode}'}
+                print("✅ Documents loaded successfully")
+            return {'success': True, 'stats': {'documents': summary}}
             
         except Exception as e:
             print(f"❌ Document loading failed: {e}")
@@ -265,47 +457,33 @@ class FullDataPipelineV2:
         
         try:
             # Check what we have to load
-            chunk_files = list(self.output_dir.glob("chunks/*.json"))
-            if not chunk_files:
+            chunk_count = _count_files(self.output_dir / "chunks", ".json")
+            if not chunk_count:
                 print("⚠️  No chunk files found. Skipping chunk loading.")
                 return {'success': True, 'stats': {'chunks': '0 (none to load)'}}
             
-            print(f"📊 Found {len(chunk_files)} chunk files to load")
-            
-            # Use existing load_chunks.py script with timeout
-            process = subprocess.Popen([
-                "python3", "load_chunks.py"
-            ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+            print(f"📊 Found {chunk_count} chunk files to load")
             
+            # Run the load_chunks.py loader in-process with timeout
             print("📊 Chunk loading progress:")
-            start_time = time.time()
-            timeout_seconds = timeout_minutes * 60
-            
-            while True:
-                # Check timeout
-                if time.time() - start_time > timeout_seconds:
-                    print(f"\n⏰ Chunk loading timeout ({timeout_minutes}min). Terminating...")
-                    process.terminate()
-                    time.sleep(5)
-                    if process.poll() is None:
-                        process.kill()
-                    return {'success': False, 'error': 'Timeout'}
-                
-                # Read output
-                output = process.stdout.readline()
-                if output:
-                    print(f"  {output.rstrip()}")
-                elif process.poll() is not None:
-                    break
-                
-                time.sleep(0.1)
+            loader = ChunkLoader(self.base_url)
+            try:
+                results = _call_with_timeout(loader.load_batch, timeout_minutes * 60)
+            except TimeoutError:
+                print(f"\n⏰ Chunk loading timeout ({timeout_minutes}min).")
+                return {'success': False, 'error': 'Timeout'}
             
-            if process.returncode == 0:
-                print("✅ Chunks loaded successfully")
-                return {'success': True, 'stats': {'chunks': f'from {len(chunk_files)} files'}}
+            if results['failed'] and not results['success']:
+                print(f"❌ No chunk files loaded ({len(results['failed'])} failed)")
+                return {'success': False, 'error': f"All {len(results['failed'])} chunk files failed to load"}
+            if results['failed']:
+                print(f"⚠️  Chunks loaded with {len(results['failed'])} failed files")
             else:
-                print("❌ Chunk loading failed")
-                return {'success': False, 'error': f'Exit code {process.returncode}'}
+                print("✅ Chunks loaded successfully")
+            summary = f"{results['stats']['total_chunks']} from {len(results['success'])} files"
+            if results['skipped']:
+                summary += f" ({len(results['skipped'])} unchanged files skipped)"
+            return {'success': True, 'stats': {'chunks': summary}}
             
         except Exception as e:
             print(f"❌ Chunk loading failed: {e}")
@@ -321,30 +499,39 @@ class FullDataPipelineV2:
             ("informed consent", "deep_dive_precise")
         ]
         
-        for i, (query, endpoint) in enumerate(test_queries, 1):
-            print(f"  {i}/3 Testing {endpoint}...")
-            try:
-                response = requests.post(
+        # The test queries are independent, so send them all at once and
+        # report in order; total latency is the slowest query, not the sum
+        with ThreadPoolExecutor(max_workers=len(test_queries)) as executor:
+            futures = [
+                executor.submit(
+                    self.session.post,
                     f"{self.base_url}/api/v1/search/{endpoint}",
                     json={"search_query": query, "limit": 3},
                     timeout=10
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    entries = data.get('entries', [])
-                    if entries:
-                        best_score = entries[0].get('metadata', {}).get('score', 0)
-                        print(f"      ✅ {len(entries)} results (best score: {best_score:.3f})")
+                for query, endpoint in test_queries
+            ]
+            
+            for i, ((query, endpoint), future) in enumerate(zip(test_queries, futures), 1):
+                print(f"  {i}/{len(test_queries)} Testing {endpoint}...")
+                try:
+                    response = future.result()
+                    
+                    if response.status_code == 200:
+                        data = response.json()
+                        entries = data.get('entries', [])
+                        if entries:
+                            best_score = entries[0].get('metadata', {}).get('score', 0)
+                            print(f"      ✅ {len(entries)} results (best score: {best_score:.3f})")
+                        else:
+                            print(f"      ⚠️  No results found")
                     else:
-                        print(f"      ⚠️  No results found")
-                else:
-                    print(f"      ❌ HTTP {response.status_code}")
+                        print(f"      ❌ HTTP {response.status_code}")
+                        return False
+                        
+                except Exception as e:
+                    print(f"      ❌ Test failed: {e}")
                     return False
-                    
-            except Exception as e:
-                print(f"      ❌ Test failed: {e}")
-                return False
         
         print("✅ Search verification completed")
         return True
@@ -7,40 +7,121 @@ Reads chunk JSON files and loads them for precise text-segment search.
 Enables finding exact passages within documents.
 """
 
+import os
 import json
+import mmap
+import time
+import hashlib
+import sqlite3
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache, partial
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 import click
 from tqdm import tqdm
 
+from concurrency_utils import bounded_map
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj) -> bytes:
+        """Compact stdlib fallback matching orjson's bytes output"""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+# Processing-code content types -> our schema's document types
+CONTENT_TYPE_MAP = {
+    'statute': 'statute',
+    'case_law': 'case', 
+    'regulation': 'regulation',
+    'contract': 'other',
+    'unknown': 'other'
+}
+
+@lru_cache(maxsize=4096)
+def _parse_metadata_file(metadata_file: str, mtime_ns: int, size: int) -> Dict:
+    """Parse a parent metadata file; the stat fields in the key make edits a cache miss"""
+    with open(metadata_file, 'rb') as f:
+        return _json_loads(f.read())
+
+def _read_metadata_file(metadata_file: Path) -> Dict:
+    """Parse a parent metadata file once per version; missing files are never cached"""
+    try:
+        stat = os.stat(metadata_file)
+    except FileNotFoundError:
+        return {}
+    return _parse_metadata_file(str(metadata_file), stat.st_mtime_ns, stat.st_size)
+
+# Chunks are sent to Superlinked in batches of roughly this size (whole files per batch)
+DEFAULT_BATCH_SIZE = 500
+
+# Files read and batches in flight at once
+DEFAULT_CONCURRENCY = 8
+
+# Hashes of chunk files (plus their parent metadata's version) already ingested,
+# so re-runs only send new or changed files
+DEFAULT_MANIFEST_PATH = Path("output/.ingested.sqlite")
+
+def _file_digest(path: Path, salt: bytes = b'') -> str:
+    """blake2b of salt plus a file's bytes; cheap enough to run on every file each load"""
+    digest = hashlib.blake2b(salt, digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Single-file, one-chunk-per-line copy of output/chunks for bulk loading
+DEFAULT_COMPACT_PATH = Path("output/chunks.jsonl")
+
 class ChunkLoader:
     """Load document chunks into Superlinked"""
     
-    def __init__(self, superlinked_url: str = "http://localhost:8080"):
+    def __init__(self, superlinked_url: str = "http://localhost:8080",
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 manifest_path: Path = DEFAULT_MANIFEST_PATH):
         self.base_url = superlinked_url
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.manifest_path = manifest_path
+        
+        # Keep-alive session shared by all ingest calls; one pooled connection
+        # per sender thread so concurrent batches never reconnect
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
+        adapter = HTTPAdapter(
+            pool_maxsize=concurrency,
+            pool_block=True,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.chunks_dir = Path("output/chunks")
         self.metadata_dir = Path("output/metadata")
         
     def get_document_metadata(self, doc_id: str) -> Dict:
         """Get metadata for parent document"""
-        metadata_file = self.metadata_dir / f"{doc_id}_metadata.json"
-        if not metadata_file.exists():
-            return {}
-            
-        with open(metadata_file, 'r') as f:
-            return json.load(f)
+        return _read_metadata_file(self.metadata_dir / f"{doc_id}_metadata.json")
     
     def map_content_type(self, content_type: str) -> str:
         """Map processing code content types to our schema"""
-        mapping = {
-            'statute': 'statute',
-            'case_law': 'case', 
-            'regulation': 'regulation',
-            'contract': 'other',
-            'unknown': 'other'
-        }
-        return mapping.get(content_type, 'other')
+        return CONTENT_TYPE_MAP.get(content_type, 'other')
         
     def map_jurisdiction(self, jurisdiction_state: str) -> str:
         """Map jurisdiction state to our categories"""
@@ -50,30 +131,36 @@ class ChunkLoader:
     
     def load_chunks_from_file(self, chunks_file: Path) -> List[Dict]:
         """Load all chunks from a chunks file"""
-        with open(chunks_file, 'r') as f:
-            chunk_data = json.load(f)
+        with open(chunks_file, 'rb') as f:
+            if ijson is not None:
+                # Stream chunk objects instead of parsing the whole file up front
+                doc_id = next(ijson.items(f, 'doc_id'))
+                f.seek(0)
+                raw_chunks = ijson.items(f, 'chunks.item', use_float=True)
+            else:
+                chunk_data = _json_loads(f.read())
+                doc_id = chunk_data['doc_id']
+                raw_chunks = chunk_data['chunks']
             
-        doc_id = chunk_data['doc_id']
-        
-        # Get parent document metadata
-        parent_metadata = self.get_document_metadata(doc_id)
-        document_type = self.map_content_type(parent_metadata.get('content_type', 'unknown'))
-        jurisdiction = self.map_jurisdiction(parent_metadata.get('jurisdiction_state'))
-        
-        # Convert chunks to our schema
-        chunk_documents = []
-        for chunk in chunk_data['chunks']:
-            chunk_doc = {
-                'id': f"{doc_id}_chunk_{chunk['chunk_index']}",
-                'parent_document_id': doc_id,
-                'chunk_index': chunk['chunk_index'],
-                'text': chunk['text'],
-                'start_char': chunk['start_char'],
-                'end_char': chunk['end_char'],
-                'document_type': document_type,
-                'jurisdiction': jurisdiction
-            }
-            chunk_documents.append(chunk_doc)
+            # Get parent document metadata (resolved once per file, not per chunk)
+            parent_metadata = self.get_document_metadata(doc_id)
+            document_type = CONTENT_TYPE_MAP.get(parent_metadata.get('content_type', 'unknown'), 'other')
+            jurisdiction = parent_metadata.get('jurisdiction_state') or 'federal'
+            
+            # Convert chunks to our schema
+            chunk_documents = [
+                {
+                    'id': f"{doc_id}_chunk_{chunk['chunk_index']}",
+                    'parent_document_id': doc_id,
+                    'chunk_index': chunk['chunk_index'],
+                    'text': chunk['text'],
+                    'start_char': chunk['start_char'],
+                    'end_char': chunk['end_char'],
+                    'document_type': document_type,
+                    'jurisdiction': jurisdiction
+                }
+                for chunk in raw_chunks
+            ]
             
         return chunk_documents
         
@@ -82,22 +169,68 @@ class ChunkLoader:
         url = f"{self.base_url}/api/v1/ingest/document_chunk"
         
         try:
-            response = requests.post(url, json=chunks, timeout=60)
+            response = self.session.post(url, data=_json_dumps(chunks), timeout=60)
             return response.status_code == 202
         except Exception as e:
-            print(f"Error ingesting chunks: {e}")
+            # Written above any active progress bar rather than breaking its redraw
+            tqdm.write(f"Error ingesting chunks: {e}")
             return False
     
-    def load_batch(self, limit: int = None) -> Dict:
-        """Load a batch of chunk files"""
+    def _send(self, chunks: List[Dict], sizes: List[int]) -> List[bool]:
+        """
+        Worker: send a batch made of consecutive per-file groups of `sizes` chunks.
+        If the batch is rejected each group is retried on its own, so one bad
+        file doesn't fail the rest; returns each group's outcome.
+        """
+        if self.ingest_chunks(chunks):
+            return [True] * len(sizes)
+        if len(sizes) == 1:
+            return [False]
+        outcome = []
+        start = 0
+        for size in sizes:
+            outcome.append(self.ingest_chunks(chunks[start:start + size]))
+            start += size
+        return outcome
+    
+    def _open_manifest(self) -> sqlite3.Connection:
+        """Open (creating if needed) the ingested-files manifest"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.manifest_path)
+        conn.execute('CREATE TABLE IF NOT EXISTS ingested(hash TEXT PRIMARY KEY, ts INTEGER)')
+        return conn
+    
+    def ingested_hashes(self) -> set:
+        """Content hashes of every chunk file ingested so far"""
+        with closing(self._open_manifest()) as conn:
+            return {h for (h,) in conn.execute('SELECT hash FROM ingested')}
+    
+    def record_ingested(self, digests: List[str]) -> None:
+        """Mark chunk file contents as ingested"""
+        now = int(time.time())
+        with closing(self._open_manifest()) as conn, conn:
+            conn.executemany('INSERT OR REPLACE INTO ingested VALUES (?, ?)',
+                             ((digest, now) for digest in digests))
+    
+    def load_batch(self, limit: int = None, force: bool = False,
+                   cancel: Optional[threading.Event] = None) -> Dict:
+        """
+        Load a batch of chunk files.
+        Files whose contents were already ingested are skipped unless force is set.
+        Setting cancel stops reading and sending, and drops any work still queued.
+        """
         chunk_files = list(self.chunks_dir.glob("*_chunks.json"))
         
         if limit:
             chunk_files = chunk_files[:limit]
             
+        # Read once up front; workers only test membership
+        ingested = set() if force else self.ingested_hashes()
+            
         results = {
             'success': [],
             'failed': [],
+            'skipped': [],
             'stats': {
                 'total_files': len(chunk_files),
                 'total_chunks': 0,
@@ -108,49 +241,268 @@ class ChunkLoader:
         
         print(f"Loading chunks from {len(chunk_files)} files...")
         
-        for chunk_file in tqdm(chunk_files):
-            try:
-                chunks = self.load_chunks_from_file(chunk_file)
+        # Chunks waiting to be sent, and the files they came from
+        buffer = []
+        pending = []
+        # (future, pending) for every batch handed to the senders
+        batches = []
+        # Caps batches queued or in flight so reading can't run far ahead of a slow server
+        in_flight = threading.BoundedSemaphore(self.concurrency * 2)
+        cancel = cancel or threading.Event()
+        
+        def submit(chunks: List[Dict], files: List) -> None:
+            # Wait for a free slot, giving up if the load is cancelled meanwhile
+            while not in_flight.acquire(timeout=1):
+                if cancel.is_set():
+                    results['failed'].extend(str(chunk_file) for chunk_file, _, _ in files)
+                    return
+            future = senders.submit(self._send, chunks, [record['chunks'] for _, _, record in files])
+            future.add_done_callback(lambda _: in_flight.release())
+            batches.append((future, files))
+        
+        # Files are read and batches sent on worker threads; all result
+        # bookkeeping stays on this thread so no locking is needed
+        with ThreadPoolExecutor(max_workers=self.concurrency) as readers, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as senders:
+            read_file = partial(self._read_new_chunk_file, ingested=ingested)
+            read = bounded_map(readers, read_file, chunk_files, self.concurrency * 2)
+            progress = tqdm(read, total=len(chunk_files))
+            for chunk_file, digest, chunks, error in progress:
+                if cancel.is_set():
+                    break
+                if error is not None:
+                    progress.write(f"Error processing {chunk_file}: {error}")
+                    results['failed'].append(str(chunk_file))
+                    continue
+                
+                if digest in ingested:
+                    results['skipped'].append(str(chunk_file))
+                    continue
                 
                 if not chunks:
                     results['failed'].append(str(chunk_file))
                     continue
                     
-                # Track stats
-                results['stats']['total_chunks'] += len(chunks)
-                doc_type = chunks[0]['document_type']
-                jurisdiction = chunks[0]['jurisdiction']
-                
-                results['stats']['by_type'][doc_type] = results['stats']['by_type'].get(doc_type, 0) + len(chunks)
-                results['stats']['by_jurisdiction'][jurisdiction] = results['stats']['by_jurisdiction'].get(jurisdiction, 0) + len(chunks)
-                
-                # Ingest chunks (batch by document)
-                if self.ingest_chunks(chunks):
-                    results['success'].append({
-                        'file': chunk_file.name,
-                        'doc_id': chunks[0]['parent_document_id'],
-                        'chunks': len(chunks),
-                        'type': doc_type,
-                        'jurisdiction': jurisdiction
-                    })
-                else:
+                # Queue whole files; send once the batch is full
+                buffer.extend(chunks)
+                pending.append((chunk_file, digest, {
+                    'file': chunk_file.name,
+                    'doc_id': chunks[0]['parent_document_id'],
+                    'chunks': len(chunks),
+                    'type': chunks[0]['document_type'],
+                    'jurisdiction': chunks[0]['jurisdiction']
+                }))
+                if len(buffer) >= self.batch_size:
+                    submit(buffer, pending)
+                    buffer, pending = [], []
+            
+            if cancel.is_set():
+                # Only calls already running are waited on when the executors exit
+                progress.close()
+                readers.shutdown(wait=False, cancel_futures=True)
+                senders.shutdown(wait=False, cancel_futures=True)
+            elif buffer:
+                submit(buffer, pending)
+        
+        # Record each file's outcome; stats only count chunks that were accepted
+        stats = results['stats']
+        loaded = []
+        for future, batch_files in batches:
+            outcome = [False] * len(batch_files) if future.cancelled() else future.result()
+            for (chunk_file, digest, record), sent in zip(batch_files, outcome):
+                if not sent:
                     results['failed'].append(str(chunk_file))
+                    continue
+                results['success'].append(record)
+                loaded.append(digest)
+                stats['total_chunks'] += record['chunks']
+                stats['by_type'][record['type']] = stats['by_type'].get(record['type'], 0) + record['chunks']
+                stats['by_jurisdiction'][record['jurisdiction']] = stats['by_jurisdiction'].get(record['jurisdiction'], 0) + record['chunks']
+        
+        if loaded:
+            self.record_ingested(loaded)
+        
+        return results
+    
+    def compact_chunks(self, out_path: Path = DEFAULT_COMPACT_PATH, limit: int = None,
+                       cancel: Optional[threading.Event] = None) -> Dict:
+        """
+        Convert every chunk file into one JSONL file, one schema-ready chunk per line.
+        Later loads read a single file sequentially instead of opening thousands.
+        Setting cancel stops reading and leaves any previous compacted file in place.
+        """
+        chunk_files = list(self.chunks_dir.glob("*_chunks.json"))
+        
+        if limit:
+            chunk_files = chunk_files[:limit]
+            
+        stats = {'files': 0, 'chunks': 0, 'failed': []}
+        cancel = cancel or threading.Event()
+        out_path = Path(out_path)
+        tmp_path = out_path.with_name(out_path.name + ".tmp")
+        
+        print(f"Compacting chunks from {len(chunk_files)} files into {out_path}...")
+        
+        with open(tmp_path, 'wb') as out, ThreadPoolExecutor(max_workers=self.concurrency) as readers:
+            read = bounded_map(readers, self._read_chunk_file, chunk_files, self.concurrency * 2)
+            progress = tqdm(read, total=len(chunk_files))
+            for chunk_file, chunks, error in progress:
+                if cancel.is_set():
+                    progress.close()
+                    readers.shutdown(wait=False, cancel_futures=True)
+                    break
+                if error is not None or not chunks:
+                    stats['failed'].append(str(chunk_file))
+                    continue
+                out.writelines(_json_dumps(chunk) + b'\n' for chunk in chunks)
+                stats['files'] += 1
+                stats['chunks'] += len(chunks)
+        
+        if cancel.is_set():
+            tmp_path.unlink()
+            return stats
+        
+        # Only replace a previous compacted file once the new one is complete
+        tmp_path.replace(out_path)
+        return stats
+    
+    def load_compacted(self, jsonl_path: Path = DEFAULT_COMPACT_PATH,
+                       cancel: Optional[threading.Event] = None) -> Dict:
+        """
+        Bulk load a file written by compact_chunks, batch_size chunks per request.
+        Setting cancel stops reading and sending, and drops any batches still queued.
+        """
+        results = {
+            'success': [],
+            'failed': [],
+            'stats': {
+                'total_files': 0,
+                'total_chunks': 0,
+                'by_type': {},
+                'by_jurisdiction': {}
+            }
+        }
+        # Per parent document, in file order: its record
+        documents = {}
+        batches = []
+        # Documents with chunks that were never sent because the load was cancelled
+        failed_docs = set()
+        # Caps batches queued or in flight so parsing can't run far ahead of a slow server
+        in_flight = threading.BoundedSemaphore(self.concurrency * 2)
+        cancel = cancel or threading.Event()
+        
+        def submit(chunks: List[Dict]) -> None:
+            # Lines are in file order, so each document's chunks form one consecutive run
+            groups = [(doc_id, sum(1 for _ in run))
+                      for doc_id, run in groupby(chunks, key=itemgetter('parent_document_id'))]
+            # Wait for a free slot, giving up if the load is cancelled meanwhile
+            while not in_flight.acquire(timeout=1):
+                if cancel.is_set():
+                    failed_docs.update(doc_id for doc_id, _ in groups)
+                    return
+            future = senders.submit(self._send, chunks, [size for _, size in groups])
+            future.add_done_callback(lambda _: in_flight.release())
+            batches.append((future, [doc_id for doc_id, _ in groups]))
+        
+        with open(jsonl_path, 'rb') as f, ThreadPoolExecutor(max_workers=self.concurrency) as senders:
+            if f.seek(0, 2) == 0:
+                return results
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                buffer = []
+                progress = tqdm(iter(mm.readline, b''), desc="Loading chunks", unit=" chunks")
+                for line in progress:
+                    if cancel.is_set():
+                        break
+                    chunk = _json_loads(line)
+                    doc_id = chunk['parent_document_id']
+                    if doc_id not in documents:
+                        documents[doc_id] = {
+                            'file': f"{doc_id}_chunks.json",
+                            'doc_id': doc_id,
+                            'chunks': 0,
+                            'type': chunk['document_type'],
+                            'jurisdiction': chunk['jurisdiction']
+                        }
+                    documents[doc_id]['chunks'] += 1
                     
-            except Exception as e:
-                print(f"Error processing {chunk_file}: {e}")
-                results['failed'].append(str(chunk_file))
+                    buffer.append(chunk)
+                    if len(buffer) >= self.batch_size:
+                        submit(buffer)
+                        buffer = []
                 
+                if cancel.is_set():
+                    # Unsent chunks, and the rest of the document being read, never go out
+                    failed_docs.update(chunk['parent_document_id'] for chunk in buffer)
+                    if documents:
+                        failed_docs.add(next(reversed(documents)))
+                    progress.close()
+                    senders.shutdown(wait=False, cancel_futures=True)
+                elif buffer:
+                    submit(buffer)
+        
+        for future, doc_ids in batches:
+            if future.cancelled():
+                failed_docs.update(doc_ids)
+                continue
+            failed_docs.update(doc_id for doc_id, sent in zip(doc_ids, future.result()) if not sent)
+        
+        stats = results['stats']
+        stats['total_files'] = len(documents)
+        for doc_id, record in documents.items():
+            if doc_id in failed_docs:
+                results['failed'].append(record['file'])
+                continue
+            results['success'].append(record)
+            stats['total_chunks'] += record['chunks']
+            stats['by_type'][record['type']] = stats['by_type'].get(record['type'], 0) + record['chunks']
+            stats['by_jurisdiction'][record['jurisdiction']] = stats['by_jurisdiction'].get(record['jurisdiction'], 0) + record['chunks']
+        
         return results
+    
+    def _parent_version(self, chunk_file: Path) -> bytes:
+        """mtime/size of a chunk file's parent metadata (b'' if missing); chunks copy its type and jurisdiction"""
+        metadata_file = self.metadata_dir / chunk_file.name.replace('_chunks.json', '_metadata.json')
+        try:
+            stat = os.stat(metadata_file)
+        except FileNotFoundError:
+            return b''
+        return f"{stat.st_mtime_ns}:{stat.st_size}".encode()
+    
+    def _read_new_chunk_file(self, chunk_file: Path, ingested: set):
+        """Worker: hash one chunk file and load it unless already ingested, returning (file, hash, chunks, error)"""
+        try:
+            # A re-processed parent changes the chunks' metadata, so it must re-ingest them too
+            digest = _file_digest(chunk_file, self._parent_version(chunk_file))
+        except Exception as e:
+            return chunk_file, None, None, e
+        if digest in ingested:
+            return chunk_file, digest, None, None
+        return (chunk_file, digest) + self._read_chunk_file(chunk_file)[1:]
+    
+    def _read_chunk_file(self, chunk_file: Path):
+        """Worker: load one chunk file, returning (file, chunks, error)"""
+        try:
+            return chunk_file, self.load_chunks_from_file(chunk_file), None
+        except Exception as e:
+            return chunk_file, None, e
 
 @click.command()
 @click.option('--limit', '-l', type=int, help='Limit number of chunk files to load')
 @click.option('--url', '-u', default='http://localhost:8080', help='Superlinked server URL')
-def main(limit, url):
+@click.option('--batch-size', '-b', type=int, default=DEFAULT_BATCH_SIZE, help='Chunks per ingest request')
+@click.option('--concurrency', '-c', type=int, default=DEFAULT_CONCURRENCY, help='Parallel file reads and ingest requests')
+@click.option('--compact', is_flag=True, help=f'Compact chunk files into {DEFAULT_COMPACT_PATH} first, then bulk load from it')
+@click.option('--from-jsonl', type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help='Bulk load a previously compacted JSONL file')
+@click.option('--force', is_flag=True, help='Re-ingest chunk files that were already loaded')
+def main(limit, url, batch_size, concurrency, compact, from_jsonl, force):
     """Load document chunks into Superlinked"""
     
+    loader = ChunkLoader(url, batch_size, concurrency)
+    
     # Check if server is running
     try:
-        response = requests.get(f"{url}/health", timeout=5)
+        response = loader.session.get(f"{url}/health", timeout=5)
         if response.status_code != 200:
             print(f"❌ Superlinked server not healthy at {url}")
             return
@@ -161,13 +513,24 @@ def main(limit, url):
     print(f"✅ Connected to Superlinked server at {url}")
     
     # Load chunks
-    loader = ChunkLoader(url)
-    results = loader.load_batch(limit)
+    if compact:
+        compacted = loader.compact_chunks(limit=limit)
+        print(f"🗜️ Compacted {compacted['chunks']} chunks from {compacted['files']} files")
+        if compacted['failed']:
+            print(f"⚠️ Skipped {len(compacted['failed'])} unreadable files: {compacted['failed'][:3]}")
+        from_jsonl = DEFAULT_COMPACT_PATH
+        
+    if from_jsonl:
+        results = loader.load_compacted(from_jsonl)
+    else:
+        results = loader.load_batch(limit, force)
     
     # Print results
     print(f"\n📊 Chunk Loading Results:")
     print(f"✅ Successfully loaded: {len(results['success'])} files")
     print(f"❌ Failed to load: {len(results['failed'])} files")
+    if results.get('skipped'):
+        print(f"⏭️ Already loaded (skipped): {len(results['skipped'])} files")
     print(f"📄 Total chunks loaded: {results['stats']['total_chunks']}")
     
     if results['stats']['by_type']:
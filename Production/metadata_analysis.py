@@ -7,12 +7,133 @@ Analyzes what fields we're extracting in preprocessing vs what we're
 successfully loading into Superlinked to identify extraction gaps.
 """
 
+import os
 import json
+import mmap
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Metadata files above this size are memory-mapped rather than read (when orjson is available)
+_MMAP_METADATA_BYTES = 1024 * 1024
+
+# Above this size, coverage-only reads stream the file (when ijson is available)
+_LARGE_METADATA_BYTES = 5 * 1024 * 1024
+
+def _read_top_level(f) -> dict:
+    """
+    Stream a JSON object's top-level fields. Nested arrays/objects are reduced to
+    empty or one-element stand-ins with the same type and truthiness, so large
+    payloads like extracted_facts are never built.
+    """
+    fields = {}
+    key = None
+    depth = 0
+    for _, event, value in ijson.parse(f, use_float=True):
+        # First event inside a top-level container: it is non-empty
+        if depth == 2 and event not in ('end_map', 'end_array') and not fields[key]:
+            fields[key] = [None] if isinstance(fields[key], list) else {None: None}
+        
+        if event in ('start_map', 'start_array'):
+            if depth == 1:
+                fields[key] = {} if event == 'start_map' else []
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+        elif depth == 1:
+            if event == 'map_key':
+                key = value
+            else:
+                fields[key] = value
+    return fields
+
+def _read_metadata(metadata_file: Path, shallow: bool = False) -> dict:
+    """
+    Parse a metadata file; large ones are parsed straight from a read-only mapping.
+    With shallow=True, very large files are streamed via _read_top_level instead.
+    """
+    with open(metadata_file, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if shallow and ijson is not None and size > _LARGE_METADATA_BYTES:
+            return _read_top_level(f)
+        if orjson is not None and size > _MMAP_METADATA_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        return _json_loads(f.read())
+
+def _try_summarize(metadata_file: str):
+    """Worker: summarize one metadata file, returning (file, (sample, present), error)"""
+    try:
+        return metadata_file, _summarize_metadata_file(metadata_file), None
+    except Exception as e:
+        return metadata_file, None, e
+
+# One sample row as printed in the preprocessing report
+_SAMPLE_TEMPLATE = (
+    "\nFile: {file}\n"
+    "  ID: {id}\n"
+    "  Title: {title}\n"
+    "  Type: {content_type}\n"
+    "  Jurisdiction: {jurisdiction_state}\n"
+    "  Facts: {fact_count}\n"
+    "  Pages: {total_pages}\n"
+    "  AI Model: {ai_model}\n"
+    "  Has Summary: {has_executive_summary}\n"
+    "  Has Findings: {has_key_findings}\n"
+    "  Has Facts: {has_extracted_facts}"
+)
+
+# How long a /health probe result is reused before the server is asked again
+_HEALTH_TTL_SECONDS = 30
+
+# Loaded-document fields that must be populated for search to work
+_CRITICAL_FIELDS = (
+    'title', 'content', 'executive_summary', 'key_findings',
+    'jurisdiction_state', 'practice_area_primary', 'extracted_facts'
+)
+
+def _summarize_metadata_file(metadata_file: str):
+    """Parse one metadata file into its sample row and {field: type name} for its non-empty fields"""
+    # Only top-level values and their truthiness are needed here
+    metadata = _read_metadata(metadata_file, shallow=True)
+    
+    sample = {
+        'file': os.path.basename(metadata_file),
+        'id': metadata.get('id'),
+        'title': metadata.get('title', '')[:50] + '...',
+        'content_type': metadata.get('content_type'),
+        'jurisdiction_state': metadata.get('jurisdiction_state'),
+        'fact_count': metadata.get('fact_count', 0),
+        'total_pages': metadata.get('total_pages', 0),
+        'ai_model': metadata.get('ai_model', ''),
+        'has_executive_summary': bool(metadata.get('executive_summary')),
+        'has_key_findings': bool(metadata.get('key_findings')),
+        'has_extracted_facts': bool(metadata.get('extracted_facts'))
+    }
+    
+    # Only count non-empty fields
+    present = {field: type(value).__name__ for field, value in metadata.items() if value}
+    return sample, present
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -23,13 +144,83 @@ class MetadataAnalyzer:
         self.base_url = base_url
         self.metadata_dir = Path("output/metadata")
         
+        # Keep-alive session shared by the health check and the search probe;
+        # no retries, so a down server is reported as quickly as the bare requests calls did
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Last sample analysis, reused while the sampled files are unchanged
+        self._sample_key = None
+        self._sample_result = None
+        # Last /health probe: when it ran and the error it raised (None = healthy)
+        self._health_checked_at = None
+        self._health_error = None
+        
+    def _check_health(self):
+        """Probe /health, reusing a result younger than _HEALTH_TTL_SECONDS; returns None or the error"""
+        now = time.monotonic()
+        if self._health_checked_at is not None and now - self._health_checked_at < _HEALTH_TTL_SECONDS:
+            return self._health_error
+        
+        try:
+            response = self.session.get(f"{self.base_url}/health", timeout=5)
+            response.raise_for_status()
+            error = None
+        except Exception as e:
+            error = e
+        
+        self._health_checked_at = now
+        self._health_error = error
+        return error
+        
+    def _iter_metadata_files(self):
+        """Yield metadata file paths (plain strings) straight from the directory listing"""
+        if not self.metadata_dir.is_dir():
+            return
+        with os.scandir(self.metadata_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('_metadata.json') and entry.is_file():
+                    yield entry.path
+        
+    def _analyze_sample(self, sample_files: list):
+        """Field coverage, field types and sample rows for the given files (memoized on their stats)"""
+        stats = [os.stat(path) for path in sample_files]
+        key = tuple((path, stat.st_mtime_ns, stat.st_size) for path, stat in zip(sample_files, stats))
+        if key == self._sample_key:
+            return self._sample_result
+        
+        field_coverage = Counter()
+        field_types = defaultdict(set)
+        sample_data = []
+        
+        # The reads overlap on threads (they wait on disk when the page cache is
+        # cold); map() hands results back in file order, so merging stays here
+        with ThreadPoolExecutor(max_workers=max(len(sample_files), 1)) as readers:
+            for metadata_file, summary, error in readers.map(_try_summarize, sample_files):
+                if error is not None:
+                    logger.error(f"Error processing {metadata_file}: {error}")
+                    continue
+                
+                sample, present = summary
+                sample_data.append(sample)
+                
+                # Track field coverage (Counter.update tallies the keys in C)
+                field_coverage.update(present.keys())
+                for field, type_name in present.items():
+                    field_types[field].add(type_name)
+        
+        self._sample_key = key
+        self._sample_result = field_coverage, field_types, sample_data
+        return self._sample_result
+        
     def analyze_preprocessing_extraction(self):
         """Analyze what fields are being extracted during preprocessing"""
         
         print("🔍 Analyzing Preprocessing Extraction")
         print("=" * 50)
         
-        metadata_files = list(self.metadata_dir.glob("*_metadata.json"))
+        metadata_files = list(self._iter_metadata_files())
         
         if not metadata_files:
             print("❌ No metadata files found")
@@ -38,68 +229,30 @@ class MetadataAnalyzer:
         print(f"📄 Found {len(metadata_files)} metadata files")
         
         # Analyze field coverage across files
-        field_coverage = defaultdict(int)
-        field_types = defaultdict(set)
         total_files = len(metadata_files)
-        
-        # Sample analysis
-        sample_data = []
-        
-        for metadata_file in metadata_files[:10]:  # Analyze first 10 files
-            try:
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                
-                sample_data.append({
-                    'file': metadata_file.name,
-                    'id': metadata.get('id'),
-                    'title': metadata.get('title', '')[:50] + '...',
-                    'content_type': metadata.get('content_type'),
-                    'jurisdiction_state': metadata.get('jurisdiction_state'),
-                    'fact_count': metadata.get('fact_count', 0),
-                    'total_pages': metadata.get('total_pages', 0),
-                    'ai_model': metadata.get('ai_model', ''),
-                    'has_executive_summary': bool(metadata.get('executive_summary')),
-                    'has_key_findings': bool(metadata.get('key_findings')),
-                    'has_extracted_facts': bool(metadata.get('extracted_facts'))
-                })
-                
-                # Track field coverage
-                for field, value in metadata.items():
-                    if value:  # Only count non-empty fields
-                        field_coverage[field] += 1
-                        field_types[field].add(type(value).__name__)
-                
-            except Exception as e:
-                logger.error(f"Error processing {metadata_file}: {e}")
+        field_coverage, field_types, sample_data = self._analyze_sample(metadata_files[:10])  # Analyze first 10 files
         
         # Display field coverage analysis
         print(f"\n📊 Field Coverage Analysis (across {total_files} files)")
         print("-" * 60)
         
-        sorted_fields = sorted(field_coverage.items(), key=lambda x: x[1], reverse=True)
+        sorted_fields = field_coverage.most_common()  # C-keyed sort, ties keep first-seen order
         
+        # Each table is assembled and written in one print rather than one per line
+        lines = []
         for field, count in sorted_fields:
             coverage_pct = (count / total_files) * 100
             types = ', '.join(field_types[field])
-            print(f"  {field:<25} {count:>3}/{total_files} ({coverage_pct:>5.1f}%) [{types}]")
+            lines.append(f"  {field:<25} {count:>3}/{total_files} ({coverage_pct:>5.1f}%) [{types}]")
+        if lines:
+            print('\n'.join(lines))
         
         # Display sample data
         print(f"\n📋 Sample Extracted Data")
         print("-" * 60)
         
-        for sample in sample_data[:5]:
-            print(f"\nFile: {sample['file']}")
-            print(f"  ID: {sample['id']}")
-            print(f"  Title: {sample['title']}")
-            print(f"  Type: {sample['content_type']}")
-            print(f"  Jurisdiction: {sample['jurisdiction_state']}")
-            print(f"  Facts: {sample['fact_count']}")
-            print(f"  Pages: {sample['total_pages']}")
-            print(f"  AI Model: {sample['ai_model']}")
-            print(f"  Has Summary: {sample['has_executive_summary']}")
-            print(f"  Has Findings: {sample['has_key_findings']}")
-            print(f"  Has Facts: {sample['has_extracted_facts']}")
+        if sample_data:
+            print('\n'.join(_SAMPLE_TEMPLATE.format_map(sample) for sample in sample_data[:5]))
         
         return field_coverage, sample_data
     
@@ -110,17 +263,15 @@ class MetadataAnalyzer:
         print("=" * 50)
         
         # Check if Superlinked is running
-        try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
-            response.raise_for_status()
-            print("✅ Superlinked server is accessible")
-        except Exception as e:
-            print(f"❌ Cannot connect to Superlinked: {e}")
+        error = self._check_health()
+        if error is not None:
+            print(f"❌ Cannot connect to Superlinked: {error}")
             return
+        print("✅ Superlinked server is accessible")
         
         # Test a basic search to see what fields are returned
         try:
-            search_response = requests.post(
+            search_response = self.session.post(
                 f"{self.base_url}/api/v1/search/discovery_search",
                 json={"search_query": "medical", "limit": 1},
                 timeout=10
@@ -159,23 +310,23 @@ class MetadataAnalyzer:
         print("=" * 50)
         
         # Load a sample metadata file
-        metadata_files = list(self.metadata_dir.glob("*_metadata.json"))
-        if not metadata_files:
+        # Only the first file is needed, so stop the listing there
+        sample_file = next(self._iter_metadata_files(), None)
+        if sample_file is None:
             print("❌ No metadata files to analyze")
             return
         
         try:
-            with open(metadata_files[0], 'r') as f:
-                sample_metadata = json.load(f)
+            sample_metadata = _read_metadata(sample_file)
             
-            print(f"📄 Sample metadata file: {metadata_files[0].name}")
+            print(f"📄 Sample metadata file: {os.path.basename(sample_file)}")
             print(f"Available fields: {list(sample_metadata.keys())}")
             
             # Simulate the loading process
             from load_real_data import SuperlinkedDataLoader
             
             loader = SuperlinkedDataLoader()
-            document, original_metadata = loader.load_document(metadata_files[0])
+            document, original_metadata = loader.load_document(sample_file)
             
             print(f"\n📊 Loading Script Output Analysis")
             print("-" * 40)
@@ -194,17 +345,13 @@ class MetadataAnalyzer:
                     print(f"  {field}: <EMPTY>")
             
             # Check critical fields
-            critical_fields = [
-                'title', 'content', 'executive_summary', 'key_findings', 
-                'jurisdiction_state', 'practice_area_primary', 'extracted_facts'
-            ]
-            
             print(f"\n🔍 Critical Fields Analysis")
             print("-" * 30)
-            for field in critical_fields:
-                value = document.get(field, '<MISSING>')
-                status = "✅" if value and value != '<MISSING>' else "❌"
-                print(f"  {status} {field}: {'Present' if value and value != '<MISSING>' else 'Empty/Missing'}")
+            for field in _CRITICAL_FIELDS:
+                if document.get(field):
+                    print(f"  ✅ {field}: Present")
+                else:
+                    print(f"  ❌ {field}: Empty/Missing")
             
             return document, original_metadata
             
@@ -212,8 +359,8 @@ class MetadataAnalyzer:
             print(f"❌ Loading script analysis failed: {e}")
             return None, None
     
-    def identify_extraction_gaps(self):
-        """Identify gaps in our extraction process"""
+    def identify_extraction_gaps(self, field_coverage=None):
+        """Identify gaps in our extraction process (pass field_coverage to reuse an earlier analysis)"""
         
         print(f"\n🎯 Identifying Extraction Gaps")
         print("=" * 50)
@@ -261,11 +408,11 @@ class MetadataAnalyzer:
         print("🚀 Potential Enhancement Fields:")
         print("-" * 40)
         
-        for field, description in potential_fields.items():
-            print(f"  💡 {field}: {description}")
+        print('\n'.join(f"  💡 {field}: {description}" for field, description in potential_fields.items()))
         
         # Check current vs potential
-        field_coverage, _ = self.analyze_preprocessing_extraction()
+        if field_coverage is None:
+            field_coverage, _ = self.analyze_preprocessing_extraction()
         current_fields = set(field_coverage.keys())
         potential_field_names = set(potential_fields.keys())
         
@@ -322,11 +469,13 @@ class MetadataAnalyzer:
             }
         ]
         
-        for rec in recommendations:
-            print(f"\n🔹 {rec['priority']} PRIORITY: {rec['category']}")
-            print(f"   Issue: {rec['issue']}")
-            print(f"   Recommendation: {rec['recommendation']}")
-            print(f"   Action: {rec['action']}")
+        print('\n'.join(
+            f"\n🔹 {rec['priority']} PRIORITY: {rec['category']}\n"
+            f"   Issue: {rec['issue']}\n"
+            f"   Recommendation: {rec['recommendation']}\n"
+            f"   Action: {rec['action']}"
+            for rec in recommendations
+        ))
         
         return recommendations
 
@@ -348,7 +497,7 @@ def main():
     document, metadata = analyzer.analyze_loading_script_mapping()
     
     # Step 4: Identify extraction gaps
-    potential_fields, missing_fields = analyzer.identify_extraction_gaps()
+    potential_fields, missing_fields = analyzer.identify_extraction_gaps(field_coverage)
     
     # Step 5: Provide recommendations
     recommendations = analyzer.recommend_improvements()
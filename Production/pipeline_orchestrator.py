@@ -526,6 +526,11 @@ class PipelineOrchestrator:
             print("⚠️  No AI-processed files found. Run preprocessing first.")
             return False
         
+        # One loader for the whole run, so every ingest and health check
+        # reuses its keep-alive session instead of reconnecting per document.
+        # Built lazily inside Step 4's try, so a failure only fails that document
+        loader = None
+        
         # Process each AI-processed file through enhancement pipeline
         for i, metadata_file in enumerate(ai_processed_files):
             print(f"\n{'='*60}")
@@ -576,8 +581,9 @@ class PipelineOrchestrator:
             # Step 4: Load this document to vector database
             print(f"\n🚀 Step 4: Vector Loading")
             try:
-                from load_real_data import SuperlinkedDataLoader
-                loader = SuperlinkedDataLoader(self.base_url)
+                if loader is None:
+                    from load_real_data import SuperlinkedDataLoader
+                    loader = SuperlinkedDataLoader(self.base_url, output_dir=self.output_dir)
                 
                 # Load the enhanced metadata if it exists, otherwise original
                 if enhanced_path.exists():
@@ -602,7 +608,7 @@ class PipelineOrchestrator:
             # Step 5: Quick validation
             print(f"\n✅ Step 5: Validation")
             try:
-                response = requests.get(f"{self.base_url}/health", timeout=5)
+                response = loader.session.get(f"{self.base_url}/health", timeout=5)
                 if response.status_code == 200:
                     print(f"   ✅ System healthy")
                     step5_success = True
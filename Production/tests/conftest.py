@@ -0,0 +1,5 @@
+"""Make the Production scripts importable by module name, as they import each other"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,53 @@
+"""Tests for concurrency_utils.bounded_map"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from concurrency_utils import bounded_map
+
+
+def test_bounded_map_preserves_order():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(bounded_map(executor, lambda x: x * x, range(20), 3)) == [x * x for x in range(20)]
+
+
+def test_bounded_map_empty_input():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert list(bounded_map(executor, str, [], 4)) == []
+
+
+def test_bounded_map_submits_at_most_window_ahead():
+    submitted = []
+    consumed = [0]
+    lock = threading.Lock()
+
+    def record(item):
+        with lock:
+            submitted.append(item)
+        return item
+
+    def items():
+        for item in range(10):
+            # Nothing past the window may be pulled before earlier results are consumed
+            assert item - consumed[0] < 3
+            yield item
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for result in bounded_map(executor, record, items(), 3):
+            consumed[0] = result + 1
+    assert sorted(submitted) == list(range(10))
+
+
+def test_bounded_map_propagates_errors():
+    def fail_on_two(item):
+        if item == 2:
+            raise ValueError(item)
+        return item
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = bounded_map(executor, fail_on_two, range(5), 2)
+        assert next(results) == 0
+        assert next(results) == 1
+        with pytest.raises(ValueError):
+            next(results)
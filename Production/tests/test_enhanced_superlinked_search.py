@@ -0,0 +1,120 @@
+"""Tests for the hierarchy mask and the one-pass legal research query"""
+import itertools
+
+import pytest
+
+from enhanced_superlinked_search import (
+    EnhancedDiscoverySearch,
+    EnhancedLegalSearchQuery,
+    hierarchy_mask,
+)
+
+
+def _entry(**fields):
+    return {'fields': fields}
+
+
+def test_hierarchy_mask_exact_match():
+    entries = [
+        _entry(jurisdiction_country='united_states', jurisdiction_state='texas'),
+        _entry(jurisdiction_country='united_states', jurisdiction_state='california'),
+        _entry(jurisdiction_country='canada', jurisdiction_state='texas'),
+    ]
+    filters = {'jurisdiction_country': 'united_states', 'jurisdiction_state': 'texas'}
+    assert hierarchy_mask(entries, filters).tolist() == [True, False, False]
+
+
+def test_hierarchy_mask_keeps_entries_missing_fields():
+    entries = [
+        _entry(jurisdiction_state='texas'),
+        _entry(),
+        {'fields': None},
+        {},
+        _entry(jurisdiction_country='united_states', jurisdiction_state=''),
+    ]
+    filters = {'jurisdiction_country': 'united_states', 'jurisdiction_state': 'texas'}
+    assert hierarchy_mask(entries, filters).all()
+
+
+def test_hierarchy_mask_unfiltered_levels_match_anything():
+    entries = [
+        _entry(jurisdiction_state='texas', jurisdiction_city='houston'),
+        _entry(jurisdiction_state='texas', jurisdiction_city='dallas'),
+        _entry(jurisdiction_state='ohio', jurisdiction_city='houston'),
+    ]
+    assert hierarchy_mask(entries, {'jurisdiction_state': 'texas'}).tolist() == [True, True, False]
+    assert hierarchy_mask(entries, {}).tolist() == [True, True, True]
+
+
+def test_hierarchy_mask_target_not_in_results():
+    entries = [_entry(jurisdiction_state='texas')]
+    assert hierarchy_mask(entries, {'jurisdiction_state': 'florida'}).tolist() == [False]
+
+
+def test_hierarchy_mask_no_entries():
+    assert hierarchy_mask([], {'jurisdiction_state': 'texas'}).tolist() == []
+
+
+def _builder_legal_query(query, jurisdiction, practice_area, prefer_recent, min_authority, limit):
+    """build_legal_research_query as the fluent builder chain it replaces"""
+    search_query = EnhancedLegalSearchQuery()
+    search_query.base_query = query
+
+    if jurisdiction:
+        if jurisdiction.lower() in ['texas', 'tx']:
+            search_query.with_jurisdiction_hierarchy(country='united_states', state='texas')
+        elif jurisdiction.lower() in ['california', 'ca']:
+            search_query.with_jurisdiction_hierarchy(country='united_states', state='california')
+
+    if practice_area:
+        if 'medical_malpractice' in practice_area.lower():
+            search_query.with_practice_area_hierarchy(primary='litigation', secondary='medical_malpractice')
+        elif 'healthcare' in practice_area.lower():
+            search_query.with_practice_area_hierarchy(primary='healthcare')
+
+    if prefer_recent:
+        search_query.with_recency_boost(decay_days=730, boost_factor=1.8)
+        search_query.prefer_recent(months_back=24)
+
+    search_query.with_document_authority(min_confidence=min_authority,
+                                         prefer_ai_model="claude-opus-4-20250514")
+    search_query.with_multi_factor_relevance()
+    search_query.with_content_focus(['title', 'executive_summary', 'key_findings',
+                                     'key_takeaways', 'legal_topics'])
+    search_query.with_document_types(['statute', 'regulation', 'case'],
+                                     preference_order=['statute', 'regulation', 'case'])
+
+    enhanced_query = search_query.build_superlinked_query()
+    enhanced_query['limit'] = limit
+    return enhanced_query
+
+
+def _scrub_clock(obj):
+    """Drop the values derived from datetime.now(), which differ between the two builds"""
+    if isinstance(obj, dict):
+        return {k: _scrub_clock(v) for k, v in obj.items()
+                if k not in ('reference_date', 'min_publication_date')}
+    return obj
+
+
+@pytest.mark.parametrize('query,jurisdiction,practice_area,prefer_recent,min_authority', list(itertools.product(
+    ['contract breach', ''],
+    ['texas', 'TX', 'ca', 'ohio', None, ''],
+    ['medical_malpractice', 'Healthcare', 'tax', None, 'healthcare_medical_malpractice'],
+    [True, False],
+    [70, 0],
+)))
+def test_fast_build_legal_matches_builder(query, jurisdiction, practice_area, prefer_recent, min_authority):
+    with EnhancedDiscoverySearch() as search:
+        fast = search.build_legal_research_query(query, jurisdiction, practice_area,
+                                                  prefer_recent, min_authority, 5)
+    expected = _builder_legal_query(query, jurisdiction, practice_area, prefer_recent, min_authority, 5)
+
+    # Same keys in the same order, so the serialized request is identical too
+    assert list(_scrub_clock(fast).items()) == list(_scrub_clock(expected).items())
+    assert list(fast) == list(expected)
+    if prefer_recent:
+        assert abs(fast['temporal_criteria']['min_publication_date'] -
+                   expected['temporal_criteria']['min_publication_date']) <= 1
+        assert abs(fast['boost_factors']['recency']['reference_date'] -
+                   expected['boost_factors']['recency']['reference_date']) <= 1
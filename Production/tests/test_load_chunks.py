@@ -0,0 +1,50 @@
+"""Tests for chunk file hashing and the ingested-files manifest"""
+import hashlib
+
+from load_chunks import ChunkLoader, _file_digest
+
+
+def test_file_digest_is_blake2b_of_salt_and_contents(tmp_path):
+    path = tmp_path / 'chunk_0.json'
+    path.write_bytes(b'{"chunk_id": "a"}')
+    assert _file_digest(path) == hashlib.blake2b(b'{"chunk_id": "a"}', digest_size=16).hexdigest()
+    assert _file_digest(path, b'salt') == hashlib.blake2b(b'salt{"chunk_id": "a"}', digest_size=16).hexdigest()
+
+
+def test_file_digest_tracks_contents_not_name(tmp_path):
+    first = tmp_path / 'a.json'
+    second = tmp_path / 'b.json'
+    first.write_bytes(b'same')
+    second.write_bytes(b'same')
+    assert _file_digest(first) == _file_digest(second)
+
+    second.write_bytes(b'changed')
+    assert _file_digest(first) != _file_digest(second)
+    assert _file_digest(first) != _file_digest(first, b'parent-version')
+
+
+def test_file_digest_reads_large_files_in_blocks(tmp_path):
+    path = tmp_path / 'big.json'
+    data = bytes(range(256)) * ((3 << 20) // 256 + 7)
+    path.write_bytes(data)
+    assert _file_digest(path) == hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def test_manifest_round_trip(tmp_path):
+    manifest_path = tmp_path / 'state' / '.ingested.sqlite'
+    loader = ChunkLoader(manifest_path=manifest_path)
+    assert loader.ingested_hashes() == set()
+    assert manifest_path.exists()
+
+    loader.record_ingested(['aa', 'bb'])
+    loader.record_ingested(['bb', 'cc'])
+    assert loader.ingested_hashes() == {'aa', 'bb', 'cc'}
+
+    # A fresh loader on the same path sees what earlier runs recorded
+    assert ChunkLoader(manifest_path=manifest_path).ingested_hashes() == {'aa', 'bb', 'cc'}
+
+
+def test_manifest_record_nothing(tmp_path):
+    loader = ChunkLoader(manifest_path=tmp_path / '.ingested.sqlite')
+    loader.record_ingested([])
+    assert loader.ingested_hashes() == set()
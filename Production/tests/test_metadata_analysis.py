@@ -0,0 +1,48 @@
+"""Tests for the streaming metadata reader"""
+import io
+import json
+
+import pytest
+
+pytest.importorskip("ijson")
+
+from metadata_analysis import _read_metadata, _read_top_level
+
+
+def _stream(obj):
+    return io.BytesIO(json.dumps(obj).encode())
+
+
+def test_read_top_level_keeps_scalars():
+    doc = {'title': 'Act', 'confidence_score': 87, 'ratio': 0.5, 'draft': False, 'note': None}
+    assert _read_top_level(_stream(doc)) == doc
+
+
+def test_read_top_level_reduces_containers_preserving_truthiness():
+    doc = {
+        'extracted_facts': [{'fact': 'a'}, {'fact': 'b'}],
+        'empty_list': [],
+        'jurisdiction': {'state': 'texas', 'city': {'name': 'houston'}},
+        'empty_map': {},
+        'after': 'kept',
+    }
+    fields = _read_top_level(_stream(doc))
+    assert fields['extracted_facts'] == [None]
+    assert fields['empty_list'] == []
+    assert fields['jurisdiction'] == {None: None}
+    assert fields['empty_map'] == {}
+    assert fields['after'] == 'kept'
+    assert {key: bool(value) for key, value in fields.items()} == \
+           {key: bool(value) for key, value in doc.items()}
+
+
+def test_read_metadata_shallow_matches_full_read_for_scalars(tmp_path, monkeypatch):
+    import metadata_analysis
+    monkeypatch.setattr(metadata_analysis, '_LARGE_METADATA_BYTES', 0)
+    path = tmp_path / 'doc_metadata.json'
+    path.write_text(json.dumps({'title': 'Act', 'key_findings': ['x'], 'score': 3}))
+    full = _read_metadata(path)
+    shallow = _read_metadata(path, shallow=True)
+    assert shallow['title'] == full['title']
+    assert shallow['score'] == full['score']
+    assert bool(shallow['key_findings']) == bool(full['key_findings'])